@@ -1,10 +1,11 @@
 
 import os
-import re
+import gzip
+import click
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for, g, send_from_directory
+from flask import Flask, render_template, jsonify, request, session, redirect, url_for, g, send_from_directory, abort
 from sqlalchemy import func, desc, text
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, IntegrityError
 from werkzeug.security import generate_password_hash, check_password_hash
 from pypdf import PdfReader
 import requests
@@ -14,6 +15,8 @@ import logging
 
 from config import Config
 from models import db, User, Book, File, ReadingState
+from scanner import scan_roots
+from library_io import export_library, import_library, parse_remap
 
 # Gunicorn과 같은 운영 서버는 자체 로깅 설정을 사용합니다.
 # 로컬 개발 환경(Waitress) 또는 직접 실행 시에만 기본 로깅을 설정하여
@@ -76,6 +79,17 @@ with app.app_context():
     init_db()
     unlock_database()
 
+def find_library_root(file_path):
+    """파일이 속한 라이브러리 루트를 찾아 (루트 이름, 루트 기준 상대 경로)를 반환합니다."""
+    pdf_path = Path(file_path)
+    # 중첩된 루트가 있을 경우 가장 구체적인(긴) 루트를 우선합니다.
+    roots = sorted(app.config['PDF_ROOTS'].items(), key=lambda item: len(item[1]), reverse=True)
+    for name, root in roots:
+        root_path = Path(root)
+        if pdf_path.is_relative_to(root_path):
+            return name, pdf_path.relative_to(root_path).as_posix()
+    return None
+
 @app.before_request
 def load_logged_in_user():
     user_id = session.get('user_id')
@@ -230,15 +244,14 @@ def reader(file_id):
             # Rollback in case of error during page count update
             db.session.rollback()
 
-    # Ensure the file path is safe and relative to the root
-    pdf_path = Path(file.file_path)
-    root_path = Path(app.config['PDF_ROOT_PATH'])
-    if not pdf_path.is_relative_to(root_path):
+    # Ensure the file path is safe and relative to one of the library roots
+    library_root = find_library_root(file.file_path)
+    if not library_root:
         return "Invalid file path", 400
 
     # Create a relative path for the URL
-    relative_path = pdf_path.relative_to(root_path).as_posix()
-    pdf_url = url_for('static_pdfs', filename=relative_path)
+    root_name, relative_path = library_root
+    pdf_url = url_for('static_pdfs', root=root_name, filename=relative_path)
 
     # Update reading state
     state = ReadingState.query.filter_by(user_id=g.user.id, file_id=file.id).first()
@@ -249,9 +262,12 @@ def reader(file_id):
 
     return render_template('reader.html', file=file, state=state, pdf_url=pdf_url)
 
-@app.route('/pdfs/<path:filename>')
-def static_pdfs(filename):
-    return send_from_directory(app.config['PDF_ROOT_PATH'], filename)
+@app.route('/pdfs/<root>/<path:filename>')
+def static_pdfs(root, filename):
+    root_path = app.config['PDF_ROOTS'].get(root)
+    if not root_path:
+        abort(404)
+    return send_from_directory(root_path, filename)
 
 # --- API Endpoints ---
 
@@ -297,79 +313,68 @@ def scan_files():
         app.logger.warning(f"Invalid batch_size '{batch_size}' received. Falling back to default 30.")
         batch_size = 30 # 0 또는 음수 값일 경우 기본값으로 복귀
 
-    pdf_root = app.config['PDF_ROOT_PATH']
-    if not pdf_root or not os.path.exists(pdf_root):
-        app.logger.error("PDF_ROOT_PATH is not configured or does not exist.")
-        return jsonify({"error": "PDF_ROOT_PATH is not configured or does not exist."}), 500
+    pdf_roots = app.config['PDF_ROOTS']
+    if not pdf_roots or not any(os.path.exists(path) for path in pdf_roots.values()):
+        app.logger.error("PDF_ROOTS (or PDF_ROOT_PATH) is not configured or does not exist.")
+        return jsonify({"error": "PDF_ROOTS (or PDF_ROOT_PATH) is not configured or does not exist."}), 500
 
     added_files_count = 0
     processed_count = 0
     # Optimize by fetching only file_path strings, not full objects
     existing_files = {row[0] for row in db.session.query(File.file_path).all()}
     
-    app.logger.info("Starting to scan for new PDF files...")
-
-    # Process files one by one instead of loading all paths into memory
-    for pdf_path in Path(pdf_root).rglob('*.pdf'):
-        pdf_path_str = str(pdf_path)
-        if pdf_path_str in existing_files:
-            continue
-
-        processed_count += 1 # Count only new files being processed
-        app.logger.info(f"Processing new file {processed_count}: {pdf_path_str}")
-        try:
-            # Extract metadata from filename
-            filename = Path(pdf_path_str).stem
-            
-            # Regex to handle cases like: "Title_01", "Title_01.5", "Title_01_special", "Title 1", "Title01"
-            match = re.match(r'^(.*?)(?:[\s_-]*)(\d+(?:\.\d+)?)(?:_.*)?$', filename)
-            
-            if match:
-                title, volume_str = match.groups()
-                title = title.strip()
-                if not title or title.isdigit():
-                    title = filename
-                    volume = 1
-                else:
-                    # For volumes like "1.5", store the integer part for sorting,
-                    # but the full filename is stored in File.title for display.
-                    volume = int(float(volume_str))
-            else:
-                title = filename
-                volume = 1
-            
-            title = title.strip()
-
-            # Get or create book
-            book = Book.query.filter_by(title=title).first()
-            if not book:
-                app.logger.info(f"New book found: '{title}'. Creating new entry.")
-                book = Book(title=title, author="Unknown")
-                db.session.add(book)
-                db.session.flush() # To get book.id
-
-            # Create file entry with total_pages=0. It will be updated on first read.
-            # The original filename is stored in the file's title field.
-            new_file = File(
-                book_id=book.id,
-                file_path=pdf_path_str,
-                volume_number=volume,
-                total_pages=0, # Set default to 0
-                title=filename, # Use original filename for file-specific title
-                author=book.author
-            )
-            db.session.add(new_file)
-            added_files_count += 1
-
-            # Commit in batches
-            if added_files_count % batch_size == 0:
-                app.logger.info(f"Committing batch of {batch_size} files to database.")
-                db.session.commit()
-                time.sleep(0.5) # Add a delay to reduce I/O load after commit
-
-        except Exception as e:
-            db.session.rollback()
-            app.logger.error(f"Failed to process {pdf_path_str}: {e}")
+    app.logger.info(f"Starting to scan for new PDF files in {len(pdf_roots)} library roots...")
+
+    # 루트별 탐색은 워커 프로세스에서 병렬로 수행하고,
+    # SQLite 잠금 경합을 피하기 위해 DB 기록은 이 프로세스에서만 수행합니다.
+    scan_results = scan_roots(
+        pdf_roots,
+        max_workers=app.config['SCAN_PROCESSES'],
+        walkers_per_root=app.config['SCAN_WALKERS_PER_ROOT']
+    )
+    for root_name, entries in scan_results:
+        for entry in entries:
+            pdf_path_str = entry['file_path']
+            if pdf_path_str in existing_files:
+                continue
+
+            processed_count += 1 # Count only new files being processed
+            app.logger.info(f"Processing new file {processed_count} in '{root_name}': {pdf_path_str}")
+            try:
+                title = entry['title']
+                filename = entry['filename']
+
+                # Get or create book
+                book = Book.query.filter_by(title=title).first()
+                if not book:
+                    app.logger.info(f"New book found: '{title}'. Creating new entry.")
+                    book = Book(title=title, author="Unknown")
+                    db.session.add(book)
+                    db.session.flush() # To get book.id
+
+                # Create file entry with total_pages=0. It will be updated on first read.
+                # The original filename is stored in the file's title field.
+                new_file = File(
+                    book_id=book.id,
+                    file_path=pdf_path_str,
+                    volume_number=entry['volume'],
+                    total_pages=0, # Set default to 0
+                    title=filename, # Use original filename for file-specific title
+                    author=book.author
+                )
+                db.session.add(new_file)
+                existing_files.add(pdf_path_str)
+                added_files_count += 1
+
+                # Commit in batches
+                if added_files_count % batch_size == 0:
+                    app.logger.info(f"Committing batch of {batch_size} files to database.")
+                    db.session.commit()
+                    time.sleep(0.5) # Add a delay to reduce I/O load after commit
+
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Failed to process {pdf_path_str}: {e}")
 
     # Commit any remaining files
     if added_files_count % batch_size != 0:
@@ -563,6 +568,43 @@ def get_books():
     
     return render_template('_book_list.html', all_groups=all_groups, pagination=pagination, search_query=search_query)
 
+# --- CLI Commands ---
+
+@app.cli.command('export-library')
+@click.argument('output_path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--batch-size', type=click.IntRange(min=1), default=1000, show_default=True, help='Rows read from the database per query.')
+def export_library_command(output_path, batch_size):
+    """책, 파일, 사용자, 독서 상태를 압축된 JSON-lines 파일로 내보냅니다."""
+    try:
+        counts = export_library(output_path, roots=app.config['PDF_ROOTS'], batch_size=batch_size)
+    except OSError as e:
+        raise click.ClickException(f"Could not write {output_path}: {e}")
+    click.echo(f"내보내기 완료: {output_path} {counts}")
+
+@app.cli.command('import-library')
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--remap', multiple=True, metavar='OLD=NEW', help='Replace an old path prefix in file paths. Overrides the default mapping of exported roots to PDF_ROOTS by name. Repeatable.')
+@click.option('--batch-size', type=click.IntRange(min=1), default=1000, show_default=True, help='Rows per bulk insert and commit.')
+@click.option('--resume', is_flag=True, help='Continue an interrupted import of the same file. Existing rows must match the exported records.')
+def import_library_command(input_path, remap, batch_size, resume):
+    """export-library로 만든 파일을 빈 데이터베이스로 가져옵니다."""
+    try:
+        counts = import_library(input_path, remap=parse_remap(remap), roots=app.config['PDF_ROOTS'],
+                                batch_size=batch_size, resume=resume)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    except (gzip.BadGzipFile, EOFError) as e:
+        raise click.ClickException(f"{input_path} is not a valid gzip-compressed export file: {e}")
+    except OSError as e:
+        raise click.ClickException(f"Could not read {input_path}: {e}")
+    except IntegrityError as e:
+        db.session.rollback()
+        raise click.ClickException(
+            f"Import stopped on a conflicting row (check --remap for colliding file paths). "
+            f"Earlier batches were already committed. {e.orig}"
+        )
+    click.echo(f"가져오기 완료: {input_path} {counts}")
+
 
 
 if __name__ == '__main__':
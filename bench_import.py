@@ -0,0 +1,79 @@
+"""
+import-library 처리량 벤치마크.
+
+임시 DB와 합성 내보내기 파일(기본 10만 개 파일)을 만들어 가져오기 속도를 측정합니다.
+실제 DB에는 영향을 주지 않습니다.
+
+    python bench_import.py --files 100000 --batch-size 1000
+"""
+import os
+import gzip
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+
+def write_synthetic_export(path, file_count, files_per_book=20, user_count=3, read_ratio=0.1):
+    """file_count개의 파일과 그에 맞는 책, 사용자, 독서 상태를 가진 내보내기 파일을 만듭니다."""
+    from library_io import EXPORT_FORMAT_VERSION
+
+    now = datetime.now().isoformat()
+    book_count = (file_count + files_per_book - 1) // files_per_book
+    read_every = max(1, int(1 / read_ratio)) if read_ratio > 0 else 0
+
+    with gzip.open(path, 'wt', encoding='utf-8') as out:
+        def write(record):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        write({'type': 'header', 'version': EXPORT_FORMAT_VERSION, 'roots': {'default': '/old/books'}})
+        for user_id in range(1, user_count + 1):
+            write({'type': 'user', 'id': user_id, 'username': f'user{user_id}', 'password_hash': None})
+        for book_id in range(1, book_count + 1):
+            write({'type': 'book', 'id': book_id, 'title': f'Series {book_id}', 'author': 'Unknown',
+                   'total_volumes': files_per_book, 'cover_url': None})
+        for file_id in range(1, file_count + 1):
+            book_id = (file_id - 1) // files_per_book + 1
+            volume = (file_id - 1) % files_per_book + 1
+            write({'type': 'file', 'id': file_id, 'book_id': book_id,
+                   'file_path': f'/old/books/Series {book_id}/Series {book_id}_{volume:02d}.pdf',
+                   'volume_number': volume, 'total_pages': 200,
+                   'title': f'Series {book_id}_{volume:02d}', 'author': 'Unknown', 'cover_url': None})
+        if read_every:
+            for state_id, file_id in enumerate(range(1, file_count + 1, read_every), start=1):
+                write({'type': 'reading_state', 'id': state_id, 'user_id': state_id % user_count + 1,
+                       'file_id': file_id, 'current_page': 42, 'last_read_at': now})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # config.py가 임포트되기 전에 임시 DB를 가리키도록 설정합니다.
+        os.environ['DB_PATH'] = os.path.join(tmp_dir, 'bench.db')
+        from app import app
+        from library_io import import_library, parse_remap
+
+        export_path = os.path.join(tmp_dir, 'library.jsonl.gz')
+        started = time.perf_counter()
+        write_synthetic_export(export_path, args.files)
+        print(f"Generated export with {args.files} files in {time.perf_counter() - started:.2f}s "
+              f"({os.path.getsize(export_path) / 1024 / 1024:.1f} MiB)")
+
+        with app.app_context():
+            started = time.perf_counter()
+            counts = import_library(export_path, remap=parse_remap(['/old/books=/new/books']),
+                                    batch_size=args.batch_size)
+            elapsed = time.perf_counter() - started
+
+        total = sum(counts.values())
+        print(f"Imported {counts} in {elapsed:.2f}s")
+        print(f"Throughput: {args.files / elapsed:,.0f} files/s, {total / elapsed:,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,24 @@ from dotenv import load_dotenv
 basedir = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(basedir, '.env'))
 
+
+def parse_pdf_roots(value, fallback_path=None):
+    """'이름=경로;이름=경로' 형식의 문자열을 {이름: 경로} 딕셔너리로 변환합니다."""
+    roots = {}
+    for entry in (value or '').split(';'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, path = entry.partition('=')
+        if not sep or not name.strip() or not path.strip():
+            raise ValueError(f"Invalid PDF_ROOTS entry '{entry}'. Expected 'name=path'.")
+        roots[name.strip()] = path.strip()
+    # PDF_ROOTS가 없으면 기존 단일 PDF_ROOT_PATH를 'default' 루트로 사용합니다.
+    if not roots and fallback_path:
+        roots['default'] = fallback_path
+    return roots
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'a-hard-to-guess-string'
     
@@ -13,6 +31,13 @@ class Config:
     DB_PATH = os.path.join(basedir, DB_PATH_RELATIVE)
 
     PDF_ROOT_PATH = os.environ.get('PDF_ROOT_PATH')
+    # 여러 라이브러리 루트: 예) PDF_ROOTS="nas=/volume1/books;usb=/volumeUSB1/usbshare/books"
+    PDF_ROOTS = parse_pdf_roots(os.environ.get('PDF_ROOTS'), PDF_ROOT_PATH)
+
+    # 스캔에 사용할 최대 프로세스 수 (0이면 CPU 코어 수)
+    SCAN_PROCESSES = int(os.environ.get('SCAN_PROCESSES') or 0)
+    # 루트(디스크)별 동시 탐색 작업 수. 느린 USB 디스크가 다른 루트를 막지 않도록 루트마다 제한합니다.
+    SCAN_WALKERS_PER_ROOT = int(os.environ.get('SCAN_WALKERS_PER_ROOT') or 1)
     
     SQLALCHEMY_DATABASE_URI = f'sqlite:///{DB_PATH}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -0,0 +1,207 @@
+import gzip
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import select, func
+
+from models import db, User, Book, File, ReadingState
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_VERSION = 1
+
+# 외래 키 순서대로 내보내고 가져옵니다. (레코드 타입, 모델)
+EXPORT_MODELS = [
+    ('user', User),
+    ('book', Book),
+    ('file', File),
+    ('reading_state', ReadingState),
+]
+MODELS_BY_TYPE = dict(EXPORT_MODELS)
+DATETIME_COLUMNS = {'reading_state': ('last_read_at',)}
+# 이어서 가져오기 시 id가 같은 기존 행이 같은 레코드인지 확인하는 자연 키
+NATURAL_KEYS = {
+    'user': ('username',),
+    'book': ('title',),
+    'file': ('file_path',),
+    'reading_state': ('user_id', 'file_id'),
+}
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_library(output_path, roots=None, batch_size=1000):
+    """
+    라이브러리와 독서 상태를 gzip으로 압축된 JSON-lines 파일로 내보냅니다.
+
+    id 기준 키셋 페이지네이션으로 batch_size 행씩 읽으므로 라이브러리 크기와 관계없이
+    메모리 사용량이 일정합니다. 첫 줄은 형식 버전과 라이브러리 루트를 담은 헤더입니다.
+    """
+    counts = {}
+    with gzip.open(output_path, 'wt', encoding='utf-8') as out:
+        header = {'type': 'header', 'version': EXPORT_FORMAT_VERSION, 'roots': roots or {}}
+        out.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+        for record_type, model in EXPORT_MODELS:
+            table = model.__table__
+            counts[record_type] = 0
+            last_id = 0
+            while True:
+                stmt = select(table).where(table.c.id > last_id).order_by(table.c.id).limit(batch_size)
+                rows = db.session.execute(stmt).mappings().all()
+                if not rows:
+                    break
+                for row in rows:
+                    record = {'type': record_type}
+                    record.update({key: _serialize(value) for key, value in row.items()})
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                counts[record_type] += len(rows)
+                last_id = rows[-1]['id']
+            logger.info(f"Exported {counts[record_type]} {record_type} records.")
+
+    return counts
+
+
+def parse_remap(values):
+    """'OLD=NEW' 문자열 목록을 가장 긴 접두사부터 적용되도록 정렬된 (OLD, NEW) 목록으로 변환합니다."""
+    remap = []
+    for value in values or ():
+        old, sep, new = value.partition('=')
+        if not sep or not old:
+            raise ValueError(f"Invalid remap '{value}'. Expected 'OLD=NEW'.")
+        remap.append((old.rstrip('/\\'), new.rstrip('/\\')))
+    remap.sort(key=lambda item: len(item[0]), reverse=True)
+    return remap
+
+
+def _is_under(path, prefix):
+    return path == prefix or (path.startswith(prefix) and path[len(prefix)] in '/\\')
+
+
+def build_remap(old_roots, new_roots, overrides=()):
+    """
+    내보낸 헤더의 루트를 이름이 같은 현재 루트로 매핑한 기본 remap을 만듭니다.
+
+    명시적인 overrides가 우선하며, override 접두사 아래에 있는 기본 매핑은 버립니다.
+    """
+    overrides = list(overrides)
+    remap = dict(overrides)
+    for name, old_path in old_roots.items():
+        new_path = new_roots.get(name)
+        if not old_path or not new_path:
+            continue
+        old_path, new_path = old_path.rstrip('/\\'), new_path.rstrip('/\\')
+        if old_path == new_path or any(_is_under(old_path, old) for old, _ in overrides):
+            continue
+        remap[old_path] = new_path
+    return sorted(remap.items(), key=lambda item: len(item[0]), reverse=True)
+
+
+def remap_path(file_path, remap):
+    """이전 라이브러리 루트 접두사를 새 루트로 바꿉니다. 일치하는 접두사가 없으면 그대로 반환합니다."""
+    for old, new in remap:
+        if _is_under(file_path, old):
+            return new + file_path[len(old):]
+    return file_path
+
+
+def _library_is_empty():
+    for _, model in EXPORT_MODELS:
+        if db.session.execute(select(func.count()).select_from(model.__table__)).scalar():
+            return False
+    return True
+
+
+def _insert_batch(record_type, rows, resume):
+    """한 타입의 행들을 한 번의 executemany로 삽입하고 커밋합니다. 삽입된 행 수를 반환합니다."""
+    table = MODELS_BY_TYPE[record_type].__table__
+    if resume:
+        # 내보내기 파일은 id 순으로 정렬되어 있으므로 범위 조회 한 번으로 이미 가져온 행을 건너뜁니다.
+        # 같은 id를 가진 행이 다른 레코드라면(예: 가져오기 전에 로그인으로 생성된 사용자) 중단합니다.
+        key_columns = NATURAL_KEYS[record_type]
+        ids = [row['id'] for row in rows]
+        existing = {
+            row[0]: tuple(row[1:])
+            for row in db.session.execute(
+                select(table.c.id, *(table.c[column] for column in key_columns))
+                .where(table.c.id.between(min(ids), max(ids)))
+            )
+        }
+        for row in rows:
+            if row['id'] in existing and existing[row['id']] != tuple(row[column] for column in key_columns):
+                raise ValueError(
+                    f"Cannot resume: existing {record_type} id {row['id']} {existing[row['id']]} "
+                    f"does not match the exported record {tuple(row[column] for column in key_columns)}."
+                )
+        rows = [row for row in rows if row['id'] not in existing]
+    if rows:
+        db.session.execute(table.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def import_library(input_path, remap=None, roots=None, batch_size=1000, resume=False):
+    """
+    export_library로 만든 파일을 스트리밍으로 읽어 batch_size 행씩 대량 삽입합니다.
+
+    원래의 id를 유지하므로 빈 데이터베이스로만 가져올 수 있습니다. 가져오기가 중단된 경우
+    resume=True로 다시 실행하면 같은 레코드로 확인된 기존 행은 건너뛰고 이어서 진행하며,
+    id는 같지만 내용이 다른 행이 있으면 ValueError를 발생시킵니다.
+
+    파일 경로는 헤더에 기록된 이전 루트를 roots에서 이름이 같은 루트로 옮기며,
+    remap으로 지정한 (OLD, NEW) 접두사가 이보다 우선합니다.
+    """
+    if not resume and not _library_is_empty():
+        raise ValueError(
+            "The database already contains library data. Import into an empty database; "
+            "resume is only for continuing an interrupted import of this same export file."
+        )
+
+    counts = {record_type: 0 for record_type, _ in EXPORT_MODELS}
+    batch_type = None
+    batch = []
+
+    with gzip.open(input_path, 'rt', encoding='utf-8') as source:
+        header = json.loads(next(source, 'null') or 'null')
+        if not header or header.get('type') != 'header':
+            raise ValueError(f"{input_path} is not a library export file.")
+        if header.get('version') != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported export format version: {header.get('version')}")
+
+        remap = build_remap(header.get('roots') or {}, roots or {}, remap or [])
+        for old, new in remap:
+            logger.info(f"Remapping file paths: '{old}' -> '{new}'")
+
+        for line_number, line in enumerate(source, start=2):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop('type', None)
+            if record_type not in MODELS_BY_TYPE:
+                raise ValueError(f"Unknown record type '{record_type}' at line {line_number}.")
+            if record.get('id') is None:
+                raise ValueError(f"Missing id at line {line_number}.")
+
+            for column in DATETIME_COLUMNS.get(record_type, ()):
+                if record.get(column):
+                    record[column] = datetime.fromisoformat(record[column])
+            if record_type == 'file' and remap:
+                record['file_path'] = remap_path(record['file_path'], remap)
+
+            if batch and (record_type != batch_type or len(batch) >= batch_size):
+                counts[batch_type] += _insert_batch(batch_type, batch, resume)
+                batch = []
+            batch_type = record_type
+            batch.append(record)
+
+        if batch:
+            counts[batch_type] += _insert_batch(batch_type, batch, resume)
+
+    for record_type, count in counts.items():
+        logger.info(f"Imported {count} {record_type} records.")
+    return counts
@@ -0,0 +1,114 @@
+import os
+import re
+import logging
+from collections import deque, Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+# 이 모듈은 워커 프로세스에서 임포트되므로 Flask 앱이나 DB를 임포트하지 않습니다.
+logger = logging.getLogger(__name__)
+
+# Regex to handle cases like: "Title_01", "Title_01.5", "Title_01_special", "Title 1", "Title01"
+VOLUME_PATTERN = re.compile(r'^(.*?)(?:[\s_-]*)(\d+(?:\.\d+)?)(?:_.*)?$')
+
+
+def parse_filename(filename):
+    """파일명(확장자 제외)에서 (책 제목, 권수)를 추출합니다."""
+    match = VOLUME_PATTERN.match(filename)
+
+    if match:
+        title, volume_str = match.groups()
+        title = title.strip()
+        if not title or title.isdigit():
+            title = filename
+            volume = 1
+        else:
+            # For volumes like "1.5", store the integer part for sorting,
+            # but the full filename is stored in File.title for display.
+            volume = int(float(volume_str))
+    else:
+        title = filename
+        volume = 1
+
+    return title.strip(), volume
+
+
+def walk_directory(directory, recursive=True):
+    """워커 프로세스에서 실행됩니다. 디렉터리 아래의 PDF를 찾아 메타데이터 목록을 반환합니다."""
+    pattern_iter = Path(directory).rglob('*.pdf') if recursive else Path(directory).glob('*.pdf')
+    entries = []
+    for pdf_path in pattern_iter:
+        if not pdf_path.is_file():
+            continue
+        filename = pdf_path.stem
+        title, volume = parse_filename(filename)
+        entries.append({
+            "file_path": str(pdf_path),
+            "filename": filename,
+            "title": title,
+            "volume": volume,
+        })
+    return entries
+
+
+def build_scan_tasks(root_path):
+    """루트를 최상위 시리즈 디렉터리 단위의 탐색 작업 (디렉터리, 재귀 여부) 목록으로 나눕니다."""
+    # 루트 바로 아래의 파일은 비재귀 작업 하나로 처리합니다.
+    tasks = [(root_path, False)]
+    with os.scandir(root_path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                tasks.append((entry.path, True))
+    return tasks
+
+
+def scan_roots(roots, max_workers=0, walkers_per_root=1):
+    """
+    여러 라이브러리 루트를 프로세스 풀에서 병렬로 탐색합니다.
+
+    각 루트마다 동시에 실행되는 작업 수를 walkers_per_root로 제한하므로
+    느린 디스크의 작업이 쌓여도 다른 루트의 작업은 계속 진행됩니다.
+    작업이 끝나는 순서대로 (루트 이름, 항목 목록)을 yield하며,
+    DB 기록은 호출하는 쪽(단일 writer)에서 담당합니다.
+    """
+    walkers_per_root = max(1, walkers_per_root)
+    pending = {}
+    for name, root_path in roots.items():
+        if not root_path or not os.path.isdir(root_path):
+            logger.warning(f"Library root '{name}' ({root_path}) does not exist. Skipping.")
+            continue
+        try:
+            pending[name] = deque(build_scan_tasks(root_path))
+        except OSError as e:
+            logger.error(f"Failed to list library root '{name}' ({root_path}): {e}")
+            continue
+        logger.info(f"Library root '{name}': {len(pending[name])} scan tasks queued.")
+
+    if not pending:
+        return
+
+    running = Counter()
+    in_flight = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers or None) as executor:
+        def submit_ready_tasks():
+            for name, queue in pending.items():
+                while queue and running[name] < walkers_per_root:
+                    directory, recursive = queue.popleft()
+                    future = executor.submit(walk_directory, directory, recursive)
+                    in_flight[future] = (name, directory)
+                    running[name] += 1
+
+        submit_ready_tasks()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, directory = in_flight.pop(future)
+                running[name] -= 1
+                try:
+                    entries = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to scan '{directory}' in library root '{name}': {e}")
+                    continue
+                yield name, entries
+            submit_ready_tasks()